@@ -3,6 +3,7 @@ Alias command implementation for git-p4son.
 """
 
 import argparse
+import sys
 from .changelist_store import (
     save_changelist_alias,
     list_changelist_aliases,
@@ -28,8 +29,9 @@ def alias_list_command(args: argparse.Namespace) -> int:
         log.info('No aliases defined')
         return 0
 
-    for name, changelist in aliases:
-        log.info(f'{name} -> {changelist}')
+    # One write for the whole listing instead of a print per alias
+    sys.stdout.write('\n'.join(
+        f'{name} -> {changelist}' for name, changelist in aliases) + '\n')
 
     return 0
 
@@ -46,7 +48,9 @@ def alias_set_command(args: argparse.Namespace) -> int:
     """
     workspace_dir = args.workspace_dir
 
-    if not args.changelist.isdigit():
+    # isdigit alone accepts non-ASCII digit characters that p4 would
+    # choke on, so require plain ASCII digits
+    if not (args.changelist.isascii() and args.changelist.isdigit()):
         log.error(f'Invalid changelist number: {args.changelist}')
         return 1
 
@@ -97,16 +101,10 @@ def alias_clean_command(args: argparse.Namespace) -> int:
     delete_all = False
     deleted_count = 0
 
-    for name, changelist in aliases:
+    for i, (name, changelist) in enumerate(aliases):
         # Interactive output stays as print() — it's a prompt-response UI
         print(f'{name} -> {changelist}')
 
-        if delete_all:
-            delete_changelist_alias(name, workspace_dir)
-            deleted_count += 1
-            print(f'  Deleted')
-            continue
-
         while True:
             try:
                 response = input(
@@ -124,9 +122,6 @@ def alias_clean_command(args: argparse.Namespace) -> int:
                 break
             elif response in ('a', 'all'):
                 delete_all = True
-                delete_changelist_alias(name, workspace_dir)
-                deleted_count += 1
-                print(f'  Deleted')
                 break
             elif response in ('q', 'quit'):
                 print(f'Deleted {deleted_count} alias(es)')
@@ -134,6 +129,17 @@ def alias_clean_command(args: argparse.Namespace) -> int:
             else:
                 print('Please enter y, n, a, or q')
 
+        if delete_all:
+            # Delete the current alias and every listed one after it;
+            # only names the user was shown are touched
+            for j, (later_name, later_changelist) in enumerate(aliases[i:]):
+                if j > 0:
+                    print(f'{later_name} -> {later_changelist}')
+                delete_changelist_alias(later_name, workspace_dir)
+                deleted_count += 1
+                print(f'  Deleted')
+            break
+
     print(f'Deleted {deleted_count} alias(es)')
     return 0
 
@@ -17,6 +17,27 @@ def _changelists_dir(workspace_dir: str) -> str:
     return os.path.join(workspace_dir, '.git-p4son', 'changelists')
 
 
+def changelist_alias_exists(name: str, workspace_dir: str) -> bool:
+    """
+    Check whether a changelist alias file exists.
+
+    Uses os.stat directly instead of os.path.exists, which swallows
+    every OSError through an internal try/except of its own.
+
+    Args:
+        name: The alias name
+        workspace_dir: The workspace root directory
+
+    Returns:
+        True if the alias file exists
+    """
+    try:
+        os.stat(os.path.join(_changelists_dir(workspace_dir), name))
+        return True
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
 def save_changelist_alias(name: str, changelist: str, workspace_dir: str, force: bool = False) -> bool:
     """
     Save a changelist number under a named alias.
@@ -37,14 +58,14 @@ def save_changelist_alias(name: str, changelist: str, workspace_dir: str, force:
         log.error(f'Alias name "{name}" is a reserved keyword')
         return False
 
-    changelists_dir = _changelists_dir(workspace_dir)
-    alias_path = os.path.join(changelists_dir, name)
-
-    if os.path.exists(alias_path) and not force:
+    if changelist_alias_exists(name, workspace_dir) and not force:
         log.error(
             f'Alias "{name}" already exists (use -f/--force to overwrite)')
         return False
 
+    changelists_dir = _changelists_dir(workspace_dir)
+    alias_path = os.path.join(changelists_dir, name)
+
     os.makedirs(changelists_dir, exist_ok=True)
 
     with open(alias_path, 'w') as f:
@@ -10,7 +10,7 @@ import sys
 import threading
 from timeit import default_timer as timer
 from datetime import timedelta
-from typing import IO, Callable
+from typing import IO, Callable, Iterator
 
 from .log import log
 
@@ -95,7 +95,7 @@ def join_command_line(command: list[str]) -> str:
 
 
 def run(command: list[str], cwd: str = '.', dry_run: bool = False,
-        input: str | None = None) -> RunResult:
+        input: str | None = None, quiet: bool = False) -> RunResult:
     """
     Run a command and return the result.
 
@@ -104,17 +104,24 @@ def run(command: list[str], cwd: str = '.', dry_run: bool = False,
         cwd: Working directory to run the command in
         dry_run: If True, only print the command without executing
         input: Optional string to pass to the subprocess via stdin
+        quiet: If True, skip command echo and spinner. Required when
+               commands run concurrently, since the spinner and the
+               command line are shared terminal state.
 
     Returns:
         RunResult object with returncode, stdout, and stderr
     """
-    log.command(join_command_line(command))
+    if not quiet:
+        log.command(join_command_line(command))
 
     if dry_run:
-        log.end_command()
+        if not quiet:
+            log.end_command()
         return RunResult(0, [], [])
 
-    if input is not None:
+    if quiet:
+        pass
+    elif input is not None:
         log.end_command()
         log.stdin(input)
     else:
@@ -131,7 +138,8 @@ def run(command: list[str], cwd: str = '.', dry_run: bool = False,
     end_timestamp = timer()
     elapsed = timedelta(seconds=end_timestamp - start_timestamp)
 
-    log.stop_spinner()
+    if not quiet:
+        log.stop_spinner()
 
     if result.returncode != 0:
         raise RunError(
@@ -144,13 +152,57 @@ def run(command: list[str], cwd: str = '.', dry_run: bool = False,
                      result.stderr.splitlines(), elapsed=elapsed)
 
 
+def run_stream(command: list[str], cwd: str = '.') -> Iterator[str]:
+    """
+    Run a command and yield stdout lines as they are produced.
+
+    Unlike run(), the output is never buffered in full; lines are yielded
+    lazily so the caller can process them while the subprocess is still
+    writing. Use this for commands with potentially unbounded output
+    (e.g. git log on a large history).
+
+    Args:
+        command: List of command arguments
+        cwd: Working directory to run the command in
+
+    Yields:
+        Output lines with trailing newlines stripped
+
+    Raises:
+        RunError: If the command exits with a non-zero return code
+                  (raised after the output has been consumed)
+    """
+    log.command(join_command_line(command))
+    log.end_command()
+
+    with subprocess.Popen(command,
+                          cwd=cwd,
+                          stdout=subprocess.PIPE,
+                          stderr=subprocess.PIPE,
+                          text=True,
+                          bufsize=-1) as process:
+        for line in process.stdout:
+            yield line.rstrip('\n')
+        stderr = process.stderr.read()
+
+    if process.returncode != 0:
+        raise RunError(
+            join_command_line(command),
+            returncode=process.returncode,
+            stderr=stderr.splitlines(),
+        )
+
+
 def enqueue_lines(stream: IO[str], output_queue: queue.Queue[str]) -> None:
     """Enqueue lines from a stream into a queue."""
     for line in iter(stream.readline, ''):
         output_queue.put(line.rstrip())
 
 
-def run_with_output(command: list[str], cwd: str = '.', on_output: Callable[..., None] | None = None) -> RunResult:
+def run_with_output(command: list[str], cwd: str = '.',
+                    on_output: Callable[..., None] | None = None,
+                    on_output_batch: Callable[..., None] | None = None,
+                    stdin: str | None = None) -> RunResult:
     """
     Run a command with real-time output processing.
 
@@ -160,12 +212,22 @@ def run_with_output(command: list[str], cwd: str = '.', on_output: Callable[...,
         on_output: Callback function for processing output lines
                    If set the funciton will be called with each
                    line and stream (stdout/stderr) as they are written.
+        on_output_batch: Like on_output, but called with all lines
+                         drained from the pipe in one go
+                         (lines=list[str], stream=...). Takes
+                         precedence over on_output and avoids one
+                         Python call per line on chatty commands.
+        stdin: Optional string to pass to the subprocess via stdin
 
     Returns:
         RunResult object with returncode, stdout, and stderr
     """
     log.command(join_command_line(command))
-    log.start_spinner()
+    if stdin is not None:
+        log.end_command()
+        log.stdin(stdin)
+    else:
+        log.start_spinner()
 
     start_timestamp = timer()
 
@@ -177,7 +239,7 @@ def run_with_output(command: list[str], cwd: str = '.', on_output: Callable[...,
                           cwd=cwd,
                           stdout=subprocess.PIPE,
                           stderr=subprocess.PIPE,
-                          stdin=None,
+                          stdin=subprocess.PIPE if stdin is not None else None,
                           text=True) as process:
 
         output_queue: queue.Queue[str] = queue.Queue()
@@ -193,28 +255,43 @@ def run_with_output(command: list[str], cwd: str = '.', on_output: Callable[...,
         out_thread.start()
         err_thread.start()
 
-        def poll_queue_until_empty(q, lines, cb):
+        # Write stdin only once the readers are draining the output
+        # pipes, so a large input cannot deadlock against a full pipe
+        # buffer. A command that exits before consuming its stdin
+        # (e.g. p4 failing to connect) raises BrokenPipeError here;
+        # swallow it and let the returncode check report the failure.
+        if stdin is not None:
+            try:
+                process.stdin.write(stdin)
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+        def dispatch(batch, stream):
+            if on_output_batch:
+                on_output_batch(lines=batch, stream=stream)
+            elif on_output:
+                for line in batch:
+                    on_output(line=line, stream=stream)
+
+        def poll_queue_until_empty(q, lines, stream):
+            batch = []
             try:
                 while not q.empty():
-                    line = q.get_nowait()
-                    lines.append(line)
-                    if cb:
-                        cb(line)
+                    batch.append(q.get_nowait())
             except queue.Empty:
                 pass
+            if batch:
+                lines.extend(batch)
+                dispatch(batch, stream)
         try:
-            def on_stdout(l): return on_output(
-                line=l, stream=sys.stdout) if on_output else None
-
-            def on_stderr(l): return on_output(
-                line=l, stream=sys.stderr) if on_output else None
             while True:
                 poll_queue_until_empty(output_queue,
                                        stdout_lines,
-                                       on_stdout)
+                                       sys.stdout)
                 poll_queue_until_empty(error_queue,
                                        stderr_lines,
-                                       on_stderr)
+                                       sys.stderr)
                 if process.poll() is not None:
                     if output_queue.empty() and error_queue.empty():
                         break
@@ -229,14 +306,12 @@ def run_with_output(command: list[str], cwd: str = '.', on_output: Callable[...,
             if final_stdout:
                 final_stdout_lines = final_stdout.splitlines()
                 stdout_lines = stdout_lines + final_stdout_lines
-                for l in final_stdout_lines:
-                    on_stdout(l)
+                dispatch(final_stdout_lines, sys.stdout)
 
             if final_stderr:
                 final_stderr_lines = final_stderr.splitlines()
                 stderr_lines = stderr_lines + final_stderr_lines
-                for l in final_stderr_lines:
-                    on_stderr(l)
+                dispatch(final_stderr_lines, sys.stderr)
 
         except KeyboardInterrupt:
             log.stop_spinner()
@@ -30,8 +30,8 @@ def create_changelist(message: str, base_branch: str, workspace_dir: str, dry_ru
         The changelist number as a string, or None for dry run.
     """
     # Build description: user message + enumerated commits
-    commit_lines = get_enumerated_commit_lines_since(
-        base_branch, workspace_dir)
+    commit_lines = list(get_enumerated_commit_lines_since(
+        base_branch, workspace_dir))
 
     description_lines = message.splitlines()
     if commit_lines:
@@ -211,8 +211,8 @@ def update_changelist(changelist_nr: str, base_branch: str, workspace_dir: str,
 
     # Generate new commit list, continuing from existing count
     start_number = len(old_commit_lines) + 1
-    new_commit_lines = get_enumerated_commit_lines_since(
-        base_branch, workspace_dir, start_number=start_number)
+    new_commit_lines = list(get_enumerated_commit_lines_since(
+        base_branch, workspace_dir, start_number=start_number))
 
     # Rebuild description: message + old commits + new commits + trailing
     new_description_lines = message_lines + \
@@ -3,42 +3,33 @@ List-changes command implementation for git-p4son.
 """
 
 import argparse
-from .common import run
+import sys
+from typing import Iterator
+from .common import run_stream
 from .log import log
 
 
-def get_commit_subjects_since(base_branch: str, workspace_dir: str) -> list[str]:
+def get_commit_subjects_since(base_branch: str, workspace_dir: str) -> Iterator[str]:
     """
-    Get list of commit subjects from git log since base branch.
+    Stream commit subjects from git log since base branch.
 
     Args:
         base_branch: The base branch to compare against
         workspace_dir: The workspace directory
 
     Returns:
-        List of commit subjects.
+        Iterator over commit subjects, oldest first.
     """
-    # Run git log to get commit subjects since base branch
-    # Using --reverse to get oldest commits first
-    res = run(['git', 'log', '--oneline', '--reverse', '{}..HEAD'.format(base_branch)],
-              cwd=workspace_dir)
+    # Using --reverse to get oldest commits first, and --format=%s so
+    # git emits exactly the subjects (no hash to strip off). The lines
+    # are streamed so arbitrarily long histories never sit in memory.
+    return run_stream(['git', 'log', '--reverse', '--format=%s',
+                       f'{base_branch}..HEAD'], cwd=workspace_dir)
 
-    # Extract just the subjects (everything after the hash and space)
-    subjects = []
-    for line in res.stdout:
-        if ' ' in line:
-            subject = line.split(' ', 1)[1]
-            subjects.append(subject)
-        else:
-            # Fallback if format is unexpected
-            subjects.append(line)
 
-    return subjects
-
-
-def get_enumerated_commit_lines_since(base_branch: str, workspace_dir: str, start_number: int = 1) -> list[str]:
+def get_enumerated_commit_lines_since(base_branch: str, workspace_dir: str, start_number: int = 1) -> Iterator[str]:
     """
-    Get enumerated commit lines from git log since base branch.
+    Stream enumerated commit lines from git log since base branch.
 
     Args:
         base_branch: The base branch to compare against
@@ -46,36 +37,12 @@ def get_enumerated_commit_lines_since(base_branch: str, workspace_dir: str, star
         start_number: The starting number for enumeration (default 1)
 
     Returns:
-        List of enumerated commit lines.
+        Iterator over enumerated commit lines.
     """
     subjects = get_commit_subjects_since(base_branch, workspace_dir)
 
-    lines = []
     for i, subject in enumerate(subjects, start_number):
-        lines.append(f"{i}. {subject}")
-
-    return lines
-
-
-def get_enumerated_change_description_since(base_branch: str, workspace_dir: str, start_number: int = 1) -> str | None:
-    """
-    Get changelist description from git log since base branch.
-
-    Args:
-        base_branch: The base branch to compare against
-        workspace_dir: The workspace directory
-        start_number: The starting number for enumeration (default 1)
-
-    Returns:
-        Description string, or None if no commits found.
-    """
-    lines = get_enumerated_commit_lines_since(
-        base_branch, workspace_dir, start_number)
-
-    if not lines:
-        return None
-
-    return '\n'.join(lines)
+        yield f"{i}. {subject}"
 
 
 def list_changes_command(args: argparse.Namespace) -> int:
@@ -88,12 +55,15 @@ def list_changes_command(args: argparse.Namespace) -> int:
     Returns:
         Exit code (0 for success, non-zero for failure)
     """
-    description = get_enumerated_change_description_since(
-        args.base_branch, args.workspace_dir)
-
-    if description:
-        log.info(description)
-    else:
+    # Write each line as it arrives instead of joining the whole
+    # history into one string first
+    line_count = 0
+    for line in get_enumerated_commit_lines_since(
+            args.base_branch, args.workspace_dir):
+        sys.stdout.write(f'{line}\n')
+        line_count += 1
+
+    if line_count == 0:
         log.info("No changes found")
 
     return 0
@@ -54,6 +54,9 @@ class Log:
         self._heading_count: int = 0
         self._spinner_thread: threading.Thread | None = None
         self._spinner_stop: threading.Event = threading.Event()
+        # Set by the spinner thread after its first frame; lets tests
+        # wait for a paint instead of sleeping
+        self._spinner_painted: threading.Event = threading.Event()
         self._spinner_line: str = ''
 
     def heading(self, text: str) -> None:
@@ -87,6 +90,16 @@ class Log:
         if self.verbose_mode:
             print(text)
 
+    def verbose_batch(self, msgs: list[str]) -> None:
+        """Print many verbose lines in a single write.
+
+        One write call for the whole batch instead of one per line,
+        which matters when a chatty subprocess emits thousands of
+        lines. Suppressed at normal verbosity.
+        """
+        if self.verbose_mode and msgs:
+            sys.stdout.write('\n'.join(msgs) + '\n')
+
     def stdin(self, text: str) -> None:
         """Print stdin input sent to a command (verbose only)."""
         if not self.verbose_mode:
@@ -110,10 +123,26 @@ class Log:
         print(f'{failed} with return code {returncode}', file=sys.stderr)
 
     def start_spinner(self) -> None:
-        """Start the spinner at the end of the current command line."""
+        """Start the spinner at the end of the current command line.
+
+        When stdout is not a TTY (scripts, CI, pipes) nobody sees the
+        animation, so the command line is finished with a plain newline
+        and no spinner thread is started.
+        """
+        if not sys.stdout.isatty():
+            print()
+            return
         self._spinner_stop.clear()
+        self._spinner_painted.clear()
+        # Prebuild every frame as bytes so each tick is a single
+        # buffer write with no per-tick formatting or encoding. The
+        # frames are passed as an argument so the thread never reads
+        # shared state that stop_spinner may touch concurrently
+        line_bytes = self._spinner_line.encode()
+        frames = [b'\r' + line_bytes + b' ' + char.encode()
+                  for char in _SPINNER_CHARS]
         self._spinner_thread = threading.Thread(
-            target=self._spin, daemon=True)
+            target=self._spin, args=(frames,), daemon=True)
         self._spinner_thread.start()
 
     def stop_spinner(self) -> None:
@@ -131,14 +160,15 @@ class Log:
         sys.stdout.write('\n')
         sys.stdout.flush()
 
-    def _spin(self) -> None:
+    def _spin(self, frames: list[bytes]) -> None:
         """Background thread: animate the spinner."""
         idx = 0
-        line = self._spinner_line
+        frame_count = len(frames)
+        out = sys.stdout.buffer
         while not self._spinner_stop.wait(_SPINNER_INTERVAL):
-            char = _SPINNER_CHARS[idx % len(_SPINNER_CHARS)]
-            sys.stdout.write(f'\r{line} {char}')
-            sys.stdout.flush()
+            out.write(frames[idx % frame_count])
+            out.flush()
+            self._spinner_painted.set()
             idx += 1
 
 
@@ -6,30 +6,36 @@ with exec lines that run git p4son new/update for each commit.
 """
 
 import argparse
+import functools
+import io
 import os
 import shlex
+import shutil
 import subprocess
+from .changelist_store import changelist_alias_exists
 from .common import run
 from .log import log
 
 
+@functools.lru_cache(maxsize=8)
 def _reviews_dir(workspace_dir: str) -> str:
     """Return the path to the reviews directory."""
     return os.path.join(workspace_dir, '.git-p4son', 'reviews')
 
 
+@functools.lru_cache(maxsize=8)
 def _todo_path(workspace_dir: str) -> str:
     """Return the path to the generated todo file."""
     return os.path.join(_reviews_dir(workspace_dir), 'todo')
 
 
 def _get_commit_lines(base_branch: str, workspace_dir: str) -> list[str]:
-    """Get git log --oneline lines for commits since base branch.
+    """Get "hash subject" lines for commits since base branch.
 
     Returns:
         List of "hash subject" lines.
     """
-    res = run(['git', 'log', '--oneline', '--reverse',
+    res = run(['git', 'log', '--reverse', '--format=%H %s',
                f'{base_branch}..HEAD'], cwd=workspace_dir)
     return res.stdout
 
@@ -39,7 +45,7 @@ def _generate_todo(commit_lines: list[str], alias: str, message: str,
     """Generate the rebase todo content with exec lines.
 
     Args:
-        commit_lines: Lines from git log --oneline (hash + subject)
+        commit_lines: Lines from git log --format='%H %s' (hash + subject)
         alias: The changelist alias name
         message: The changelist description for the new command
         force: Whether to pass --force to the new command
@@ -47,30 +53,30 @@ def _generate_todo(commit_lines: list[str], alias: str, message: str,
     Returns:
         The generated todo file content
     """
-    lines = []
+    # The quoted alias and message are loop-invariant, so build both
+    # exec commands once up front
+    quoted_alias = shlex.quote(alias)
+    # First commit: create new changelist with review
+    new_cmd = f'new {quoted_alias} --review -m {shlex.quote(message)}'
+    if force:
+        new_cmd += ' --force'
+    # Subsequent commits: update and shelve
+    update_cmd = f'update {quoted_alias} --shelve'
+
+    buf = io.StringIO()
     last_index = len(commit_lines) - 1
     for i, commit_line in enumerate(commit_lines):
-        parts = commit_line.split(' ', 1)
-        commit_hash = parts[0]
-        subject = parts[1] if len(parts) > 1 else ''
+        commit_hash, _, subject = commit_line.partition(' ')
 
-        lines.append(f'pick {commit_hash} {subject}')
-
-        if i == 0:
-            # First commit: create new changelist with review
-            cmd = f'new {shlex.quote(alias)} --review -m {shlex.quote(message)}'
-            if force:
-                cmd += ' --force'
-        else:
-            # Subsequent commits: update and shelve
-            cmd = f'update {shlex.quote(alias)} --shelve'
+        buf.write(f'pick {commit_hash} {subject}\n')
 
+        cmd = new_cmd if i == 0 else update_cmd
         # Sleep after all exec lines except the last
         if i < last_index:
             cmd += ' --sleep 5'
-        lines.append(f'exec git p4son {cmd}')
+        buf.write(f'exec git p4son {cmd}\n')
 
-    return '\n'.join(lines) + '\n'
+    return buf.getvalue()
 
 
 def review_command(args: argparse.Namespace) -> int:
@@ -90,9 +96,7 @@ def review_command(args: argparse.Namespace) -> int:
 
     # Check alias availability before starting
     if not args.dry_run:
-        alias_path = os.path.join(
-            workspace_dir, '.git-p4son', 'changelists', args.alias)
-        if os.path.exists(alias_path) and not args.force:
+        if changelist_alias_exists(args.alias, workspace_dir) and not args.force:
             log.error(
                 f'Alias "{args.alias}" already exists '
                 f'(use -f/--force to overwrite)')
@@ -143,9 +147,39 @@ def review_command(args: argparse.Namespace) -> int:
         log.info('Done')
         return 0
     finally:
-        # Clean up the todo file
-        if os.path.exists(todo_file):
+        # Clean up the todo file. It was written just above, so remove
+        # it directly instead of paying for an extra stat first.
+        try:
             os.remove(todo_file)
+        except FileNotFoundError:
+            pass
+
+
+def _resolve_editor(workspace_dir: str) -> str | None:
+    """Resolve the user's editor command.
+
+    GIT_EDITOR sits at the top of git's precedence order, so it alone
+    may short-circuit the subprocess. Everything else (core.editor,
+    VISUAL, EDITOR) is left to git var GIT_EDITOR, which applies the
+    documented precedence.
+
+    Returns:
+        The editor command string, or None if it could not be resolved.
+    """
+    editor = os.environ.get('GIT_EDITOR')
+    if editor:
+        return editor
+
+    # git var emits a single line, so only a stdout pipe is needed;
+    # stderr passes through and no text-mode decoder wrapper is set up
+    result = subprocess.run(
+        ['git', 'var', 'GIT_EDITOR'],
+        stdout=subprocess.PIPE,
+        cwd=workspace_dir,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.decode('utf-8', 'replace').strip()
 
 
 def sequence_editor_command(args: argparse.Namespace) -> int:
@@ -168,35 +202,37 @@ def sequence_editor_command(args: argparse.Namespace) -> int:
         log.error(f'No review todo file found at {todo_file}')
         return 1
 
-    # Read the original git todo file to preserve comment lines
+    # Read the original git todo file to preserve comment lines. git
+    # only writes its comment block at the tail of the todo, so scan
+    # backwards from the end instead of testing every line.
     with open(args.filename, 'r') as f:
         original_lines = f.readlines()
-    comment_lines = [line for line in original_lines if line.startswith('#')]
-
-    # Read our generated todo
-    with open(todo_file, 'r') as f:
-        todo_content = f.read()
-
-    # Overwrite the rebase todo file with our version plus git's comments
-    with open(args.filename, 'w') as f:
-        f.write(todo_content)
+    tail_start = len(original_lines)
+    while tail_start > 0 and (
+            original_lines[tail_start - 1].startswith('#')
+            or original_lines[tail_start - 1] == '\n'):
+        tail_start -= 1
+    comment_lines = [line for line in original_lines[tail_start:]
+                     if line.startswith('#')]
+
+    # Copy our generated todo plus git's comments to a sibling temp
+    # file and move it into place, replacing the rebase todo in a
+    # single atomic rename. copyfileobj streams the bytes through the
+    # kernel (sendfile on Linux) instead of round-tripping the whole
+    # content through a Python string.
+    tmp_filename = args.filename + '.tmp'
+    with open(todo_file, 'rb') as src, open(tmp_filename, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
         if comment_lines:
-            f.write('\n')
-            f.writelines(comment_lines)
+            dst.write(b'\n')
+            dst.writelines(line.encode() for line in comment_lines)
+    os.replace(tmp_filename, args.filename)
 
-    # Resolve the user's editor via git var GIT_EDITOR
-    result = subprocess.run(
-        ['git', 'var', 'GIT_EDITOR'],
-        capture_output=True,
-        text=True,
-        cwd=workspace_dir,
-    )
-    if result.returncode != 0:
+    editor = _resolve_editor(workspace_dir)
+    if not editor:
         log.error('Failed to resolve editor via git var GIT_EDITOR')
         return 1
 
-    editor = result.stdout.strip()
-
     # Open the editor on the todo file
     # The editor command may contain arguments (e.g. "code --wait"),
     # so we need to split it
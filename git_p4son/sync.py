@@ -3,6 +3,8 @@ Sync command implementation for git-p4son.
 """
 
 import argparse
+import concurrent.futures
+import functools
 import re
 from typing import IO
 
@@ -11,115 +13,181 @@ from .changelist_store import resolve_changelist
 from .log import log
 
 
+# Precompiled patterns for p4/git output parsing, hoisted out of the
+# per-line hot paths.
+_LAST_SYNC_RE = re.compile(r"^(\d+|pergit|git-p4son): p4 sync //\.\.\.@(\d+)$")
+_CHANGE_RE = re.compile(r'Change (\d+)')
+
+
+_CLOBBER_PREFIX = "Can't clobber writable file "
+
+# Small integer mode codes returned by parse_p4_sync_line; MODE_NAMES
+# maps them back to the short labels used in output.
+MODE_ADD, MODE_DEL, MODE_UPD, MODE_CLB = range(4)
+MODE_NAMES = ('add', 'del', 'upd', 'clb')
+
+
 def get_writable_files(stderr_lines: list[str]) -> list[str]:
     """Extract writable files from p4 sync stderr output."""
-    cant_clobber_prefix = "Can't clobber writable file "
     writable_files = []
     for line in stderr_lines:
-        if not line.startswith(cant_clobber_prefix):
+        if not line.startswith(_CLOBBER_PREFIX):
             continue
-        writable_file = line[len(cant_clobber_prefix):]
+        writable_file = line[len(_CLOBBER_PREFIX):]
         writable_files.append(writable_file.rstrip())
     return writable_files
 
 
-def parse_p4_sync_line(line: str) -> tuple[str | None, str | None]:
-    """Parse a line from p4 sync output."""
-    patterns = [
-        ('add', ' - added as '),
-        ('del', ' - deleted as '),
-        ('upd', ' - updating '),
-        ('clb', "Can't clobber writable file ")
-    ]
-    for mode, pattern in patterns:
-        tokens = line.split(pattern)
-        if len(tokens) == 2:
-            return (mode, tokens[1])
+def parse_p4_sync_line(line: str) -> tuple[int | None, str | None]:
+    """Parse a line from p4 sync output into (mode code, filename).
 
+    A prefix check for the clobber message, then one find per full
+    marker. Matching the complete markers keeps depot paths that
+    themselves contain ' - ' parsing correctly.
+    """
+    if line.startswith(_CLOBBER_PREFIX):
+        return (MODE_CLB, line[len(_CLOBBER_PREFIX):])
+    idx = line.find(' - added as ')
+    if idx != -1:
+        return (MODE_ADD, line[idx + len(' - added as '):])
+    idx = line.find(' - deleted as ')
+    if idx != -1:
+        return (MODE_DEL, line[idx + len(' - deleted as '):])
+    idx = line.find(' - updating ')
+    if idx != -1:
+        return (MODE_UPD, line[idx + len(' - updating '):])
     return (None, None)
 
 
-class SyncStats:
-    """Statistics for sync operations."""
-
-    def __init__(self) -> None:
-        self.count: int = 0
-
-
 class P4SyncOutputProcessor:
     """Process p4 sync output in real-time."""
 
     def __init__(self, file_count_to_sync: int) -> None:
         self.synced_file_count: int = 0
         self.file_count_to_sync: int = file_count_to_sync
-        self.stats: dict[str, SyncStats] = {}
-        for mode in ['add', 'del', 'upd', 'clb']:
-            self.stats[mode] = SyncStats()
+        # Per-mode counters indexed by the MODE_* codes: incrementing
+        # is a plain list subscript with no hashing or attribute lookup
+        self.counts: list[int] = [0, 0, 0, 0]
 
     def __call__(self, line: str, stream: IO[str]) -> None:
-        if re.search(r"//...@\d+ - file\(s\) up-to-date\.", line):
+        # Plain suffix check; lines are already newline-stripped by
+        # run_with_output, and a regex is overkill for a fixed message
+        if line.endswith(' - file(s) up-to-date.'):
             log.info('all files up to date')
             return
 
+        # Only build the verbose strings when they will be printed;
+        # otherwise every synced file pays for a discarded allocation
+        verbose = log.verbose_mode
+
         mode, filename = parse_p4_sync_line(line)
-        if not mode or not filename:
-            log.verbose(f'Unparsable line: {line}')
+        if mode is None or not filename:
+            if verbose:
+                log.verbose(f'Unparsable line: {line}')
             return
 
-        if mode in self.stats:
-            self.stats[mode].count += 1
+        self.counts[mode] += 1
         self.synced_file_count += 1
 
-        if self.file_count_to_sync >= 0:
-            log.verbose(
-                f'{mode}: {filename}  ({self.synced_file_count}/{self.file_count_to_sync})')
-        else:
-            log.verbose(f'{mode}: {filename}')
+        if verbose:
+            if self.file_count_to_sync >= 0:
+                log.verbose(
+                    f'{MODE_NAMES[mode]}: {filename}  ({self.synced_file_count}/{self.file_count_to_sync})')
+            else:
+                log.verbose(f'{MODE_NAMES[mode]}: {filename}')
+
+    def process_batch(self, lines: list[str], stream: IO[str]) -> None:
+        """Process a batch of output lines drained from the pipe.
+
+        Same logic as __call__, but with the hot names bound as locals
+        for the duration of the batch and the counters written back
+        once at the end.
+        """
+        parse = parse_p4_sync_line
+        verbose = log.verbose_mode
+        total = self.file_count_to_sync
+        synced = self.synced_file_count
+        counts = self.counts
+        mode_names = MODE_NAMES
+        pending_verbose: list[str] = []
+
+        for line in lines:
+            if line.endswith(' - file(s) up-to-date.'):
+                log.info('all files up to date')
+                continue
+
+            mode, filename = parse(line)
+            if mode is None or not filename:
+                if verbose:
+                    pending_verbose.append(f'Unparsable line: {line}')
+                continue
+
+            counts[mode] += 1
+            synced += 1
+
+            if verbose:
+                if total >= 0:
+                    pending_verbose.append(
+                        f'{mode_names[mode]}: {filename}  ({synced}/{total})')
+                else:
+                    pending_verbose.append(f'{mode_names[mode]}: {filename}')
+
+        if pending_verbose:
+            log.verbose_batch(pending_verbose)
+
+        self.synced_file_count = synced
 
     def get_summary(self) -> str:
         """Get a one-line sync summary."""
-        synced_count = self.stats['add'].count + \
-            self.stats['upd'].count - self.stats['clb'].count
-        parts = []
-        if self.stats['add'].count:
-            parts.append(f"add: {self.stats['add'].count}")
-        if self.stats['upd'].count:
-            parts.append(f"upd: {self.stats['upd'].count}")
-        if self.stats['del'].count:
-            parts.append(f"del: {self.stats['del'].count}")
-        if self.stats['clb'].count:
-            parts.append(f"clb: {self.stats['clb'].count}")
+        counts = self.counts
+        synced_count = counts[MODE_ADD] + counts[MODE_UPD] - counts[MODE_CLB]
+        parts = [f'{MODE_NAMES[mode]}: {counts[mode]}'
+                 for mode in (MODE_ADD, MODE_UPD, MODE_DEL, MODE_CLB)
+                 if counts[mode]]
         detail = ', '.join(parts)
         if detail:
             return f'synced {synced_count} files ({detail})'
         return f'synced {synced_count} files'
 
 
-def p4_force_sync_file(changelist: int, filename: str, workspace_dir: str) -> None:
-    """Force sync a single file."""
-    output_processor = P4SyncOutputProcessor(-1)
+def p4_force_sync_files(changelist: int, filenames: list[str],
+                        workspace_dir: str) -> None:
+    """Force sync files in a single p4 invocation.
+
+    The file list is fed to p4 -x - via stdin, so N files cost one
+    server round trip instead of one per file.
+    """
+    file_args = '\n'.join(f'{filename}@{changelist}'
+                          for filename in filenames)
+    output_processor = P4SyncOutputProcessor(len(filenames))
     result = run_with_output(
-        ['p4', 'sync', '-f', '%s@%s' % (filename, changelist)],
-        cwd=workspace_dir, on_output=output_processor)
+        ['p4', '-x', '-', 'sync', '-f'],
+        cwd=workspace_dir, stdin=file_args,
+        on_output_batch=output_processor.process_batch)
     log.info(output_processor.get_summary())
     if result.elapsed:
         log.elapsed(result.elapsed)
 
 
-def get_file_count_to_sync(changelist: int, workspace_dir: str) -> int:
-    """Get the number of files that need to be synced."""
-    res = run(['p4', 'sync', '-n', '//...@%s' %
-              (changelist)], cwd=workspace_dir)
-    return len(res.stdout)
+def p4_sync_preview(changelist: int, workspace_dir: str) -> list[str]:
+    """Preview a sync: the p4 sync -n output lines for the changelist."""
+    res = run(['p4', 'sync', '-n', f'//...@{changelist}'], cwd=workspace_dir)
+    return res.stdout
 
 
-def p4_sync(changelist: int, force: bool, workspace_dir: str) -> bool:
+def p4_sync(changelist: int, force: bool, workspace_dir: str,
+            preview_lines: list[str] | None = None) -> bool:
     """Sync files from Perforce.
 
+    The caller may pass the p4_sync_preview output to avoid repeating
+    the p4 sync -n round trip.
+
     Returns True on success, False if writable files were found without --force.
     Raises CommandError on actual command failures.
     """
-    file_count_to_sync = get_file_count_to_sync(changelist, workspace_dir)
+    if preview_lines is None:
+        preview_lines = p4_sync_preview(changelist, workspace_dir)
+    file_count_to_sync = len(preview_lines)
     if file_count_to_sync == 0:
         log.info('all files up to date')
         return True
@@ -128,8 +196,8 @@ def p4_sync(changelist: int, force: bool, workspace_dir: str) -> bool:
     output_processor = P4SyncOutputProcessor(file_count_to_sync)
     try:
         result = run_with_output(
-            ['p4', 'sync', '//...@%s' % (changelist)],
-            cwd=workspace_dir, on_output=output_processor)
+            ['p4', 'sync', f'//...@{changelist}'],
+            cwd=workspace_dir, on_output_batch=output_processor.process_batch)
         log.info(output_processor.get_summary())
         if result.elapsed:
             log.elapsed(result.elapsed)
@@ -141,8 +209,7 @@ def p4_sync(changelist: int, force: bool, workspace_dir: str) -> bool:
             raise
         log.info(f'Found {len(writable_files)} writable files')
         if force:
-            for filename in writable_files:
-                p4_force_sync_file(changelist, filename, workspace_dir)
+            p4_force_sync_files(changelist, writable_files, workspace_dir)
             return True
         else:
             log.info('Leaving files as is, use --force to force sync')
@@ -151,15 +218,16 @@ def p4_sync(changelist: int, force: bool, workspace_dir: str) -> bool:
             return False
 
 
-def p4_is_workspace_clean(workspace_dir: str) -> bool:
+def p4_is_workspace_clean(workspace_dir: str, quiet: bool = False) -> bool:
     """Check if Perforce workspace is clean."""
-    res = run_with_output(['p4', 'opened'], cwd=workspace_dir)
+    res = run(['p4', 'opened'], cwd=workspace_dir, quiet=quiet)
     return len(res.stdout) == 0
 
 
-def git_is_workspace_clean(workspace_dir: str) -> bool:
+def git_is_workspace_clean(workspace_dir: str, quiet: bool = False) -> bool:
     """Check if git workspace is clean."""
-    res = run_with_output(['git', 'status', '--porcelain'], cwd=workspace_dir)
+    res = run(['git', 'status', '--porcelain'],
+              cwd=workspace_dir, quiet=quiet)
     return len(res.stdout) == 0
 
 
@@ -178,22 +246,44 @@ def git_commit(message: str, workspace_dir: str, allow_empty: bool = False) -> N
 
 def git_changelist_of_last_sync(workspace_dir: str) -> int | None:
     """Get the changelist number from the most recent sync commit."""
+    # -F makes the grep a plain substring match (no regex escaping or
+    # engine cost in git); -1 stops the walk at the first match
     res = run_with_output(
-        ['git', 'log', '-1', '--pretty=%s',
-         '--grep=: p4 sync //\\.\\.\\.@'],
+        ['git', 'log', '-1', '-F',
+         '--grep=: p4 sync //...@', '--pretty=%s'],
         cwd=workspace_dir)
     if len(res.stdout) == 0:
         return None
 
     msg = res.stdout[0]
-    pattern = r"^(\d+|pergit|git-p4son): p4 sync //\.\.\.@(\d+)$"
-    match = re.search(pattern, msg)
+    match = _LAST_SYNC_RE.search(msg)
     if match:
         return int(match.group(2))
     else:
         return None
 
 
+@functools.lru_cache(maxsize=16)
+def _p4_client_name(workspace_dir: str) -> str:
+    """Look up the p4 client name for a workspace via p4 info.
+
+    The client name never changes within one invocation, so the lookup
+    is memoized per workspace directory to avoid repeated p4 info
+    round trips.
+    """
+    res = run(['p4', 'info'], cwd=workspace_dir)
+
+    prefix = 'Client name:'
+    client_name = next(
+        (line[len(prefix):].strip()
+         for line in res.stdout if line.startswith(prefix)),
+        None)
+
+    if not client_name:
+        raise CommandError('No client name found in p4 info output')
+    return client_name
+
+
 def get_latest_changelist_affecting_workspace(workspace_dir: str) -> int:
     """
     Get the latest changelist that affects files in the client's workspace view.
@@ -205,17 +295,7 @@ def get_latest_changelist_affecting_workspace(workspace_dir: str) -> int:
     Returns:
         The latest changelist number.
     """
-    # First, get the client name
-    res = run(['p4', 'info'], cwd=workspace_dir)
-
-    client_name = None
-    for line in res.stdout:
-        if line.startswith('Client name:'):
-            client_name = line.split(':', 1)[1].strip()
-            break
-
-    if not client_name:
-        raise CommandError('No client name found in p4 info output')
+    client_name = _p4_client_name(workspace_dir)
 
     # Get the latest changelist that affects files in the client's workspace view
     res = run(['p4', 'changes', '-m1', '-s', 'submitted',
@@ -225,7 +305,7 @@ def get_latest_changelist_affecting_workspace(workspace_dir: str) -> int:
 
     # Parse the changelist number from the output
     line = res.stdout[0]
-    match = re.search(r'Change (\d+)', line)
+    match = _CHANGE_RE.search(line)
     if not match:
         raise CommandError(f'Failed to parse changelist from: {line}')
     return int(match.group(1))
@@ -243,17 +323,23 @@ def sync_command(args: argparse.Namespace) -> int:
     """
     workspace_dir = args.workspace_dir
 
-    log.heading('Checking git workspace')
-    if not git_is_workspace_clean(workspace_dir):
-        log.error('workspace is not clean, aborting')
-        return 1
-    log.info('clean')
-
-    log.heading('Checking p4 workspace')
-    if not p4_is_workspace_clean(workspace_dir):
-        log.error('workspace is not clean, aborting')
-        return 1
-    log.info('clean')
+    log.heading('Checking workspaces')
+    # The two checks are independent subprocesses; overlap them and
+    # report in order. Quiet mode keeps the shared command echo and
+    # spinner out of the concurrent section.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        git_clean_future = executor.submit(
+            git_is_workspace_clean, workspace_dir, quiet=True)
+        p4_clean_future = executor.submit(
+            p4_is_workspace_clean, workspace_dir, quiet=True)
+        if not git_clean_future.result():
+            log.error('git workspace is not clean, aborting')
+            return 1
+        log.detail('git', 'clean')
+        if not p4_clean_future.result():
+            log.error('p4 workspace is not clean, aborting')
+            return 1
+        log.detail('p4', 'clean')
 
     # Resolve changelist alias (skip special keywords)
     if args.changelist.lower() not in ('latest', 'last-synced'):
@@ -291,7 +377,7 @@ def sync_command(args: argparse.Namespace) -> int:
         try:
             args.changelist = int(args.changelist)
         except ValueError:
-            log.error('Invalid changelist number: %s' % args.changelist)
+            log.error(f'Invalid changelist number: {args.changelist}')
             return 1
 
     if last_changelist == args.changelist:
@@ -312,7 +398,13 @@ def sync_command(args: argparse.Namespace) -> int:
 
     if last_changelist is not None:
         log.heading(f'Syncing to CL {last_changelist}')
-        if not p4_sync(last_changelist, args.force, workspace_dir):
+        # Preview here so the safety sync to the last synced CL can be
+        # skipped outright without p4_sync re-running p4 sync -n
+        preview = p4_sync_preview(last_changelist, workspace_dir)
+        if not preview:
+            log.info('all files up to date')
+        elif not p4_sync(last_changelist, args.force, workspace_dir,
+                         preview_lines=preview):
             log.error('Failed to sync files from perforce')
             return 1
 
@@ -325,7 +417,7 @@ def sync_command(args: argparse.Namespace) -> int:
     if not git_is_workspace_clean(workspace_dir):
         git_add_all_files(workspace_dir)
 
-    commit_msg = 'git-p4son: p4 sync //...@%s' % (args.changelist)
+    commit_msg = f'git-p4son: p4 sync //...@{args.changelist}'
     git_commit(commit_msg, workspace_dir, allow_empty=True)
 
     log.info('Done')
@@ -2,6 +2,7 @@
 
 import os
 import subprocess
+import sys
 import tempfile
 import unittest
 from unittest import mock
@@ -16,6 +17,7 @@ from git_p4son.common import (
     is_workspace_dir,
     join_command_line,
     run,
+    run_stream,
     run_with_output,
 )
 
@@ -142,6 +144,21 @@ class TestRun(unittest.TestCase):
         self.assertEqual(result.stdout, ['line1', 'line2'])
         self.assertEqual(result.stderr, [])
 
+    @mock.patch('git_p4son.common.log')
+    @mock.patch('subprocess.run')
+    def test_quiet_skips_command_echo_and_spinner(self, mock_subprocess_run,
+                                                  mock_log):
+        mock_subprocess_run.return_value = mock.Mock(
+            returncode=0,
+            stdout='',
+            stderr='',
+        )
+        result = run(['git', 'status'], quiet=True)
+        self.assertEqual(result.returncode, 0)
+        mock_log.command.assert_not_called()
+        mock_log.start_spinner.assert_not_called()
+        mock_log.stop_spinner.assert_not_called()
+
     def test_dry_run_returns_empty_result(self):
         result = run(['git', 'status'], dry_run=True)
         self.assertEqual(result.returncode, 0)
@@ -161,6 +178,29 @@ class TestRun(unittest.TestCase):
         self.assertEqual(ctx.exception.stderr, ['error'])
 
 
+class TestRunStream(unittest.TestCase):
+    def test_yields_lines_lazily(self):
+        lines = run_stream(
+            [sys.executable, '-c', 'print("line1"); print("line2")'])
+        self.assertEqual(next(lines), 'line1')
+        self.assertEqual(next(lines), 'line2')
+        with self.assertRaises(StopIteration):
+            next(lines)
+
+    def test_empty_output(self):
+        lines = list(run_stream([sys.executable, '-c', 'pass']))
+        self.assertEqual(lines, [])
+
+    def test_nonzero_returncode_raises_run_error(self):
+        lines = run_stream(
+            [sys.executable, '-c',
+             'import sys; print("out"); print("err", file=sys.stderr); sys.exit(3)'])
+        with self.assertRaises(RunError) as ctx:
+            list(lines)
+        self.assertEqual(ctx.exception.returncode, 3)
+        self.assertEqual(ctx.exception.stderr, ['err'])
+
+
 class TestRunWithOutput(unittest.TestCase):
     @mock.patch('subprocess.Popen')
     def test_calls_popen_and_returns_result(self, mock_popen_cls):
@@ -203,6 +243,61 @@ class TestRunWithOutput(unittest.TestCase):
                           for call in callback.call_args_list]
         self.assertIn('hello', callback_lines)
 
+    @mock.patch('subprocess.Popen')
+    def test_batch_callback_is_invoked(self, mock_popen_cls):
+        mock_process = mock.MagicMock()
+        mock_process.stdout.readline = mock.Mock(side_effect=['hello\n', ''])
+        mock_process.stderr.readline = mock.Mock(side_effect=[''])
+        mock_process.poll = mock.Mock(side_effect=[None, 0])
+        mock_process.returncode = 0
+        mock_process.communicate.return_value = ('', '')
+        mock_process.__enter__ = mock.Mock(return_value=mock_process)
+        mock_process.__exit__ = mock.Mock(return_value=False)
+        mock_popen_cls.return_value = mock_process
+
+        batch_callback = mock.Mock()
+        run_with_output(['echo', 'hello'], on_output_batch=batch_callback)
+        batched_lines = []
+        for call in batch_callback.call_args_list:
+            batched_lines.extend(call.kwargs['lines'])
+        self.assertIn('hello', batched_lines)
+
+    @mock.patch('subprocess.Popen')
+    def test_stdin_is_written_to_subprocess(self, mock_popen_cls):
+        mock_process = mock.MagicMock()
+        mock_process.stdout.readline = mock.Mock(side_effect=[''])
+        mock_process.stderr.readline = mock.Mock(side_effect=[''])
+        mock_process.poll = mock.Mock(side_effect=[0])
+        mock_process.returncode = 0
+        mock_process.communicate.return_value = ('', '')
+        mock_process.__enter__ = mock.Mock(return_value=mock_process)
+        mock_process.__exit__ = mock.Mock(return_value=False)
+        mock_popen_cls.return_value = mock_process
+
+        run_with_output(['p4', '-x', '-', 'sync', '-f'], stdin='a@1\nb@1')
+        self.assertEqual(
+            mock_popen_cls.call_args.kwargs['stdin'], subprocess.PIPE)
+        mock_process.stdin.write.assert_called_once_with('a@1\nb@1')
+        mock_process.stdin.close.assert_called_once()
+
+    @mock.patch('subprocess.Popen')
+    def test_broken_stdin_pipe_raises_run_error(self, mock_popen_cls):
+        """A command that dies before reading stdin reports a RunError,
+        not an uncaught BrokenPipeError."""
+        mock_process = mock.MagicMock()
+        mock_process.stdout.readline = mock.Mock(side_effect=[''])
+        mock_process.stderr.readline = mock.Mock(side_effect=[''])
+        mock_process.stdin.write = mock.Mock(side_effect=BrokenPipeError)
+        mock_process.poll = mock.Mock(side_effect=[1])
+        mock_process.returncode = 1
+        mock_process.communicate.return_value = ('', '')
+        mock_process.__enter__ = mock.Mock(return_value=mock_process)
+        mock_process.__exit__ = mock.Mock(return_value=False)
+        mock_popen_cls.return_value = mock_process
+
+        with self.assertRaises(RunError):
+            run_with_output(['p4', '-x', '-', 'sync', '-f'], stdin='a@1')
+
 
 class TestCommandError(unittest.TestCase):
     def test_message_and_returncode(self):
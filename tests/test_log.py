@@ -1,7 +1,6 @@
 """Tests for git_p4son.log module."""
 
 import sys
-import time
 from datetime import timedelta
 from unittest.mock import patch
 
@@ -82,6 +81,26 @@ class TestVerbose:
         out = capsys.readouterr().out
         assert out == 'debug info\n'
 
+    def test_verbose_batch_suppressed_by_default(self, capsys):
+        log = Log()
+        log.verbose_batch(['one', 'two'])
+        out = capsys.readouterr().out
+        assert out == ''
+
+    def test_verbose_batch_writes_all_lines(self, capsys):
+        log = Log()
+        log.verbose_mode = True
+        log.verbose_batch(['one', 'two'])
+        out = capsys.readouterr().out
+        assert out == 'one\ntwo\n'
+
+    def test_verbose_batch_empty_list(self, capsys):
+        log = Log()
+        log.verbose_mode = True
+        log.verbose_batch([])
+        out = capsys.readouterr().out
+        assert out == ''
+
 
 class TestStdin:
     def test_stdin_suppressed_by_default(self, capsys):
@@ -138,12 +157,22 @@ class TestSpinner:
     def test_start_and_stop_spinner(self):
         log = Log()
         log._spinner_line = '> p4 sync'
-        log.start_spinner()
+        with patch.object(sys.stdout, 'isatty', return_value=True):
+            log.start_spinner()
         assert log._spinner_thread is not None
         assert log._spinner_thread.is_alive()
         log.stop_spinner()
         assert log._spinner_thread is None
 
+    def test_spinner_skipped_when_not_tty(self, capsys):
+        log = Log()
+        log._spinner_line = '> p4 sync'
+        log.start_spinner()
+        assert log._spinner_thread is None
+        # The command line is still finished with a newline
+        out = capsys.readouterr().out
+        assert out == '\n'
+
     def test_stop_spinner_when_not_started(self):
         log = Log()
         # Should not raise
@@ -153,9 +182,10 @@ class TestSpinner:
     def test_stop_spinner_reprints_clean_line(self):
         log = Log()
         log._spinner_line = '> p4 sync'
-        log.start_spinner()
-        # Let spinner run briefly
-        time.sleep(0.15)
+        with patch.object(sys.stdout, 'isatty', return_value=True):
+            log.start_spinner()
+        # Wait until the spinner has painted at least one frame
+        assert log._spinner_painted.wait(timeout=1.0)
         with patch('sys.stdout') as mock_stdout:
             mock_stdout.isatty.return_value = False
             log.stop_spinner()
@@ -166,7 +196,8 @@ class TestSpinner:
     def test_spinner_thread_is_daemon(self):
         log = Log()
         log._spinner_line = '> cmd'
-        log.start_spinner()
+        with patch.object(sys.stdout, 'isatty', return_value=True):
+            log.start_spinner()
         assert log._spinner_thread.daemon is True
         log.stop_spinner()
 
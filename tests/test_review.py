@@ -77,7 +77,7 @@ class TestGetCommitLines(unittest.TestCase):
         self.assertEqual(
             lines, ['abc1234 First commit', 'def5678 Second commit'])
         mock_run.assert_called_once_with(
-            ['git', 'log', '--oneline', '--reverse', 'main..HEAD'],
+            ['git', 'log', '--reverse', '--format=%H %s', 'main..HEAD'],
             cwd='/workspace',
         )
 
@@ -147,7 +147,8 @@ class TestReviewCommand(unittest.TestCase):
             dry_run=False,
             workspace_dir='/workspace',
         )
-        with mock.patch('os.path.exists', return_value=True):
+        with mock.patch('git_p4son.review.changelist_alias_exists',
+                        return_value=True):
             rc = review_command(args)
         self.assertEqual(rc, 1)
 
@@ -202,7 +203,7 @@ class TestSequenceEditorCommand(unittest.TestCase):
         # First call: git var GIT_EDITOR
         # Second call: editor
         mock_subprocess_run.side_effect = [
-            mock.Mock(returncode=0, stdout='vim\n'),
+            mock.Mock(returncode=0, stdout=b'vim\n'),
             mock.Mock(returncode=0),
         ]
 
@@ -210,11 +211,15 @@ class TestSequenceEditorCommand(unittest.TestCase):
                          workspace_dir='/workspace')
         todo_file = os.path.join('/workspace', '.git-p4son', 'reviews', 'todo')
 
-        with mock.patch('os.path.exists', return_value=True):
-            with mock.patch('builtins.open', mock.mock_open(read_data=todo_content)):
-                rc = sequence_editor_command(args)
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with mock.patch('os.path.exists', return_value=True):
+                with mock.patch('builtins.open', mock.mock_open(read_data=todo_content)):
+                    with mock.patch('os.replace') as mock_replace:
+                        rc = sequence_editor_command(args)
 
         self.assertEqual(rc, 0)
+        mock_replace.assert_called_once_with(
+            '/tmp/git-rebase-todo.tmp', '/tmp/git-rebase-todo')
         # Verify git var GIT_EDITOR was called
         first_call = mock_subprocess_run.call_args_list[0]
         self.assertEqual(first_call[0][0], ['git', 'var', 'GIT_EDITOR'])
@@ -240,10 +245,10 @@ class TestSequenceEditorCommand(unittest.TestCase):
             "# Commands:\n"
             "# p, pick <commit> = use commit\n"
         )
-        our_todo = "pick abc First\nexec git p4son new feat --review -m 'msg'\n"
+        our_todo = b"pick abc First\nexec git p4son new feat --review -m 'msg'\n"
 
         mock_subprocess_run.side_effect = [
-            mock.Mock(returncode=0, stdout='vim\n'),
+            mock.Mock(returncode=0, stdout=b'vim\n'),
             mock.Mock(returncode=0),
         ]
 
@@ -256,9 +261,9 @@ class TestSequenceEditorCommand(unittest.TestCase):
         def open_side_effect(path, mode='r'):
             if path == '/tmp/git-rebase-todo' and mode == 'r':
                 return mock.mock_open(read_data=git_original)()
-            elif path == todo_file and mode == 'r':
+            elif path == todo_file and mode == 'rb':
                 return mock.mock_open(read_data=our_todo)()
-            elif path == '/tmp/git-rebase-todo' and mode == 'w':
+            elif path == '/tmp/git-rebase-todo.tmp' and mode == 'wb':
                 m = mock.MagicMock()
                 m.__enter__ = mock.Mock(return_value=m)
                 m.__exit__ = mock.Mock(return_value=False)
@@ -267,12 +272,14 @@ class TestSequenceEditorCommand(unittest.TestCase):
                 return m
             return mock.mock_open()()
 
-        with mock.patch('os.path.exists', return_value=True):
-            with mock.patch('builtins.open', side_effect=open_side_effect):
-                rc = sequence_editor_command(args)
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with mock.patch('os.path.exists', return_value=True):
+                with mock.patch('builtins.open', side_effect=open_side_effect):
+                    with mock.patch('os.replace'):
+                        rc = sequence_editor_command(args)
 
         self.assertEqual(rc, 0)
-        full_output = ''.join(written)
+        full_output = b''.join(written).decode()
         # Our todo content is included
         self.assertIn("pick abc First", full_output)
         self.assertIn("exec git p4son new feat", full_output)
@@ -287,21 +294,43 @@ class TestSequenceEditorCommand(unittest.TestCase):
         """Editor commands like 'code --wait' should be split properly."""
         todo_content = "pick abc First\n"
         mock_subprocess_run.side_effect = [
-            mock.Mock(returncode=0, stdout='code --wait\n'),
+            mock.Mock(returncode=0, stdout=b'code --wait\n'),
             mock.Mock(returncode=0),
         ]
 
         args = mock.Mock(filename='/tmp/git-rebase-todo',
                          workspace_dir='/workspace')
-        with mock.patch('os.path.exists', return_value=True):
-            with mock.patch('builtins.open', mock.mock_open(read_data=todo_content)):
-                rc = sequence_editor_command(args)
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with mock.patch('os.path.exists', return_value=True):
+                with mock.patch('builtins.open', mock.mock_open(read_data=todo_content)):
+                    with mock.patch('os.replace'):
+                        rc = sequence_editor_command(args)
 
         self.assertEqual(rc, 0)
         second_call = mock_subprocess_run.call_args_list[1]
         self.assertEqual(second_call[0][0], [
                          'code', '--wait', '/tmp/git-rebase-todo'])
 
+    @mock.patch('git_p4son.review.subprocess.run')
+    def test_editor_from_environment(self, mock_subprocess_run):
+        """GIT_EDITOR from the environment skips the git var subprocess."""
+        todo_content = "pick abc First\n"
+        mock_subprocess_run.return_value = mock.Mock(returncode=0)
+
+        args = mock.Mock(filename='/tmp/git-rebase-todo',
+                         workspace_dir='/workspace')
+        with mock.patch.dict(os.environ, {'GIT_EDITOR': 'nano'}, clear=True):
+            with mock.patch('os.path.exists', return_value=True):
+                with mock.patch('builtins.open', mock.mock_open(read_data=todo_content)):
+                    with mock.patch('os.replace'):
+                        rc = sequence_editor_command(args)
+
+        self.assertEqual(rc, 0)
+        # Only the editor itself is spawned, no git var call
+        mock_subprocess_run.assert_called_once()
+        self.assertEqual(mock_subprocess_run.call_args[0][0],
+                         ['nano', '/tmp/git-rebase-todo'])
+
 
 if __name__ == '__main__':
     unittest.main()
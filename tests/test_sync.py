@@ -6,8 +6,12 @@ from unittest import mock
 
 from git_p4son.common import CommandError, RunError
 from git_p4son.sync import (
+    MODE_ADD,
+    MODE_CLB,
+    MODE_DEL,
+    MODE_UPD,
     P4SyncOutputProcessor,
-    get_file_count_to_sync,
+    _p4_client_name,
     get_latest_changelist_affecting_workspace,
     get_writable_files,
     git_add_all_files,
@@ -16,6 +20,7 @@ from git_p4son.sync import (
     git_is_workspace_clean,
     p4_is_workspace_clean,
     p4_sync,
+    p4_sync_preview,
     parse_p4_sync_line,
     sync_command,
 )
@@ -26,27 +31,33 @@ class TestParseP4SyncLine(unittest.TestCase):
     def test_added_file(self):
         mode, filename = parse_p4_sync_line(
             '//depot/foo.txt#1 - added as /ws/foo.txt')
-        self.assertEqual(mode, 'add')
+        self.assertEqual(mode, MODE_ADD)
         self.assertEqual(filename, '/ws/foo.txt')
 
     def test_deleted_file(self):
         mode, filename = parse_p4_sync_line(
             '//depot/foo.txt#2 - deleted as /ws/foo.txt')
-        self.assertEqual(mode, 'del')
+        self.assertEqual(mode, MODE_DEL)
         self.assertEqual(filename, '/ws/foo.txt')
 
     def test_updated_file(self):
         mode, filename = parse_p4_sync_line(
             '//depot/foo.txt#3 - updating /ws/foo.txt')
-        self.assertEqual(mode, 'upd')
+        self.assertEqual(mode, MODE_UPD)
         self.assertEqual(filename, '/ws/foo.txt')
 
     def test_clobber_file(self):
         mode, filename = parse_p4_sync_line(
             "Can't clobber writable file /ws/foo.txt")
-        self.assertEqual(mode, 'clb')
+        self.assertEqual(mode, MODE_CLB)
         self.assertEqual(filename, '/ws/foo.txt')
 
+    def test_path_containing_separator(self):
+        mode, filename = parse_p4_sync_line(
+            '//depot/My Game - Assets/foo.uasset#3 - updating /ws/foo.uasset')
+        self.assertEqual(mode, MODE_UPD)
+        self.assertEqual(filename, '/ws/foo.uasset')
+
     def test_unparsable_line(self):
         mode, filename = parse_p4_sync_line('some random output')
         self.assertIsNone(mode)
@@ -68,39 +79,45 @@ class TestGetWritableFiles(unittest.TestCase):
 
 
 class TestGitIsWorkspaceClean(unittest.TestCase):
-    @mock.patch('git_p4son.sync.run_with_output')
-    def test_clean_workspace(self, mock_rwo):
-        mock_rwo.return_value = make_run_result(stdout=[])
+    @mock.patch('git_p4son.sync.run')
+    def test_clean_workspace(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=[])
         self.assertTrue(git_is_workspace_clean('/ws'))
 
-    @mock.patch('git_p4son.sync.run_with_output')
-    def test_dirty_workspace(self, mock_rwo):
-        mock_rwo.return_value = make_run_result(stdout=['M file.txt'])
+    @mock.patch('git_p4son.sync.run')
+    def test_dirty_workspace(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=['M file.txt'])
         self.assertFalse(git_is_workspace_clean('/ws'))
 
-    @mock.patch('git_p4son.sync.run_with_output')
-    def test_command_failure(self, mock_rwo):
-        mock_rwo.side_effect = RunError('git status failed')
+    @mock.patch('git_p4son.sync.run')
+    def test_quiet_is_passed_through(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=[])
+        git_is_workspace_clean('/ws', quiet=True)
+        self.assertTrue(mock_run.call_args.kwargs['quiet'])
+
+    @mock.patch('git_p4son.sync.run')
+    def test_command_failure(self, mock_run):
+        mock_run.side_effect = RunError('git status failed')
         with self.assertRaises(RunError):
             git_is_workspace_clean('/ws')
 
 
 class TestP4IsWorkspaceClean(unittest.TestCase):
-    @mock.patch('git_p4son.sync.run_with_output')
-    def test_clean(self, mock_rwo):
-        mock_rwo.return_value = make_run_result(stdout=[])
+    @mock.patch('git_p4son.sync.run')
+    def test_clean(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=[])
         self.assertTrue(p4_is_workspace_clean('/ws'))
 
-    @mock.patch('git_p4son.sync.run_with_output')
-    def test_dirty(self, mock_rwo):
-        mock_rwo.return_value = make_run_result(stdout=[
+    @mock.patch('git_p4son.sync.run')
+    def test_dirty(self, mock_run):
+        mock_run.return_value = make_run_result(stdout=[
             '//depot/foo.txt#1 - edit default change (text)'
         ])
         self.assertFalse(p4_is_workspace_clean('/ws'))
 
-    @mock.patch('git_p4son.sync.run_with_output')
-    def test_command_failure(self, mock_rwo):
-        mock_rwo.side_effect = RunError('p4 opened failed')
+    @mock.patch('git_p4son.sync.run')
+    def test_command_failure(self, mock_run):
+        mock_run.side_effect = RunError('p4 opened failed')
         with self.assertRaises(RunError):
             p4_is_workspace_clean('/ws')
 
@@ -197,10 +214,16 @@ class TestGitChangelistOfLastSync(unittest.TestCase):
         result = git_changelist_of_last_sync('/ws')
         self.assertEqual(result, 99999)
         cmd = mock_rwo.call_args[0][0]
-        self.assertIn('--grep=: p4 sync //\\.\\.\\.@', cmd)
+        self.assertIn('-F', cmd)
+        self.assertIn('--grep=: p4 sync //...@', cmd)
 
 
 class TestGetLatestChangelistAffectingWorkspace(unittest.TestCase):
+    def setUp(self):
+        # The client name lookup is memoized per workspace_dir; clear
+        # it so each test sees its own mocked p4 info output
+        _p4_client_name.cache_clear()
+
     @mock.patch('git_p4son.sync.run')
     def test_success(self, mock_run):
         mock_run.side_effect = [
@@ -236,40 +259,55 @@ class TestGetLatestChangelistAffectingWorkspace(unittest.TestCase):
             get_latest_changelist_affecting_workspace('/ws')
 
 
-class TestGetFileCountToSync(unittest.TestCase):
+class TestP4SyncPreview(unittest.TestCase):
     @mock.patch('git_p4son.sync.run')
-    def test_returns_count(self, mock_run):
+    def test_returns_preview_lines(self, mock_run):
         mock_run.return_value = make_run_result(stdout=[
             '//depot/a.txt - added',
             '//depot/b.txt - updating',
         ])
-        count = get_file_count_to_sync(12345, '/ws')
-        self.assertEqual(count, 2)
+        lines = p4_sync_preview(12345, '/ws')
+        self.assertEqual(lines, [
+            '//depot/a.txt - added',
+            '//depot/b.txt - updating',
+        ])
 
     @mock.patch('git_p4son.sync.run')
     def test_failure(self, mock_run):
         mock_run.side_effect = RunError('p4 sync -n failed')
         with self.assertRaises(RunError):
-            get_file_count_to_sync(12345, '/ws')
+            p4_sync_preview(12345, '/ws')
 
 
 class TestP4SyncOutputProcessor(unittest.TestCase):
     def test_tracks_added_file(self):
         processor = P4SyncOutputProcessor(10)
         processor('//depot/foo.txt#1 - added as /ws/foo.txt', sys.stdout)
-        self.assertEqual(processor.stats['add'].count, 1)
+        self.assertEqual(processor.counts[MODE_ADD], 1)
         self.assertEqual(processor.synced_file_count, 1)
 
     def test_tracks_deleted_file(self):
         processor = P4SyncOutputProcessor(10)
         processor('//depot/foo.txt#2 - deleted as /ws/foo.txt', sys.stdout)
-        self.assertEqual(processor.stats['del'].count, 1)
+        self.assertEqual(processor.counts[MODE_DEL], 1)
 
     def test_up_to_date_message(self):
         processor = P4SyncOutputProcessor(10)
         processor('//...@12345 - file(s) up-to-date.', sys.stdout)
         self.assertEqual(processor.synced_file_count, 0)
 
+    def test_process_batch_tracks_all_lines(self):
+        processor = P4SyncOutputProcessor(10)
+        processor.process_batch([
+            '//depot/foo.txt#1 - added as /ws/foo.txt',
+            '//depot/bar.txt#3 - updating /ws/bar.txt',
+            '//depot/baz.txt#2 - deleted as /ws/baz.txt',
+        ], sys.stdout)
+        self.assertEqual(processor.counts[MODE_ADD], 1)
+        self.assertEqual(processor.counts[MODE_UPD], 1)
+        self.assertEqual(processor.counts[MODE_DEL], 1)
+        self.assertEqual(processor.synced_file_count, 3)
+
 
 class TestP4Sync(unittest.TestCase):
     @mock.patch('git_p4son.sync.run_with_output')
@@ -294,6 +332,7 @@ class TestP4Sync(unittest.TestCase):
 
 
 class TestSyncCommand(unittest.TestCase):
+    @mock.patch('git_p4son.sync.p4_sync_preview', return_value=['//depot/a.txt - added'])
     @mock.patch('git_p4son.sync.git_commit')
     @mock.patch('git_p4son.sync.git_add_all_files')
     @mock.patch('git_p4son.sync.git_is_workspace_clean')
@@ -302,7 +341,8 @@ class TestSyncCommand(unittest.TestCase):
     @mock.patch('git_p4son.sync.git_changelist_of_last_sync', return_value=10000)
     @mock.patch('git_p4son.sync.p4_is_workspace_clean', return_value=True)
     def test_sync_specific_cl(self, _p4clean, _last_cl, _p4sync,
-                              _resolve, mock_git_clean, _git_add, _git_commit):
+                              _resolve, mock_git_clean, _git_add, _git_commit,
+                              _count):
         # First call: initial check (clean), second call: after sync (dirty -> add files)
         mock_git_clean.side_effect = [True, False]
         args = mock.Mock(changelist='12345', force=False, workspace_dir='/ws')
@@ -332,6 +372,7 @@ class TestSyncCommand(unittest.TestCase):
         rc = sync_command(args)
         self.assertEqual(rc, 1)
 
+    @mock.patch('git_p4son.sync.p4_sync_preview', return_value=['//depot/a.txt - added'])
     @mock.patch('git_p4son.sync.resolve_changelist', return_value='100')
     @mock.patch('git_p4son.sync.git_commit')
     @mock.patch('git_p4son.sync.git_add_all_files')
@@ -340,7 +381,8 @@ class TestSyncCommand(unittest.TestCase):
     @mock.patch('git_p4son.sync.git_changelist_of_last_sync', return_value=200)
     @mock.patch('git_p4son.sync.p4_is_workspace_clean', return_value=True)
     def test_older_cl_with_force_proceeds(self, _p4clean, _last_cl,
-                                          _p4sync, mock_git_clean, _add, _commit, _resolve):
+                                          _p4sync, mock_git_clean, _add, _commit, _resolve,
+                                          _count):
         mock_git_clean.side_effect = [True, False]
         args = mock.Mock(changelist='100', force=True, workspace_dir='/ws')
         rc = sync_command(args)
@@ -367,6 +409,7 @@ class TestSyncCommand(unittest.TestCase):
         self.assertEqual(rc, 0)
         mock_p4sync.assert_called_once_with(100, False, '/ws')
 
+    @mock.patch('git_p4son.sync.p4_sync_preview', return_value=['//depot/a.txt - added'])
     @mock.patch('git_p4son.sync.get_latest_changelist_affecting_workspace')
     @mock.patch('git_p4son.sync.git_commit')
     @mock.patch('git_p4son.sync.git_is_workspace_clean')
@@ -374,7 +417,7 @@ class TestSyncCommand(unittest.TestCase):
     @mock.patch('git_p4son.sync.git_changelist_of_last_sync', return_value=100)
     @mock.patch('git_p4son.sync.p4_is_workspace_clean', return_value=True)
     def test_latest_keyword(self, _p4clean, _last_cl, _p4sync,
-                            mock_git_clean, _commit, mock_get_latest):
+                            mock_git_clean, _commit, mock_get_latest, _count):
         mock_get_latest.return_value = 200
         mock_git_clean.side_effect = [True, True]  # clean before and after
         args = mock.Mock(changelist='latest', force=False, workspace_dir='/ws')